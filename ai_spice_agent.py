@@ -6,51 +6,41 @@ import re
 import sys
 import csv  # ==== NEW: for CSV output
 import json
+import hashlib
+import itertools
+import shutil
+import tarfile
+import tempfile
+import time
 import argparse
 import subprocess
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 
 # ==== NEW: run sweep headlessly to export CSV/plots (used by both modes)
-def sweep_and_export(gate, vdd, temps, loads_list, single_load_line, jpg_flag):
-    import csv
+def sweep_and_export(gate, vdd, temps, loads_list, single_load_line, jpg_flag, ws=None):
+    deps = load_deps()
+    model_hash = sha256_file(MODEL_PATH)
     csv_rows = []
+    point_ids = []
     all_metric_names = set()
     metric_points_by_temp = {}
 
     for t in temps:
         for load_text in (loads_list or [""]):
-            load_line = f"Cl out 0 {load_text}" if load_text else single_load_line
-            cap_tag = sanitize_cap_for_tag(load_text) if load_text else "noC"
-
-            net = build_netlist(gate, vdd, int(t), load_line, cap_tag, interactive=False)
-            deck_name = f"agent_run_{t}C_{cap_tag}.cir"
             print(f"\n[CSV sweep] TEMP={t}C, Cload={load_text or 'n/a'} ...")
-            meas = run_ngspice(net, deck_name, interactive=False)
-
-            # parse -> ps
-            if meas:
-                meas_ps = meas_to_ps(meas)
+            meas_ps, outputs = simulate_point(gate, vdd, int(t), load_text, single_load_line, ws)
+            if meas_ps:
                 print("  (ps):", pretty_ps(meas_ps))
-            else:
-                meas_ps = {}
 
             # waveform PNG (optional)
-            dat = f"sim_{t}C_{cap_tag}.dat"
-            png = f"agent_run_{t}C_{cap_tag}.png"
-            _ = plot_from_wrdata(dat, png, gate)
+            _ = plot_from_wrdata(outputs["dat"], outputs["png"], gate)
+            point_ids.append(record_point(deps, gate, vdd, int(t), load_text, single_load_line, meas_ps,
+                                          ws.kept(outputs) if ws else outputs, model_hash=model_hash))
 
             # CSV row
-            row = {
-                "gate": gate,
-                "vdd_V": vdd,
-                "temp_C": int(t),
-                "load": load_text or "",
-                "load_fF": cap_text_to_fF(load_text) if load_text else ""
-            }
-            for k, v in meas_ps.items():
-                row[k] = float(v)
-                all_metric_names.add(k)
-            csv_rows.append(row)
+            csv_rows.append(make_csv_row(gate, vdd, int(t), load_text, meas_ps))
+            all_metric_names.update(meas_ps)
 
             # collect points for delay-vs-C plots
             c_val = cap_text_to_fF(load_text) if load_text else None
@@ -58,23 +48,16 @@ def sweep_and_export(gate, vdd, temps, loads_list, single_load_line, jpg_flag):
                 metric_points_by_temp.setdefault(k, {}).setdefault(int(t), []).append((c_val, float(v)))
 
     # write CSV
-    base_cols = ["gate", "vdd_V", "temp_C", "load", "load_fF"]
-    metric_cols = sorted(all_metric_names)
-    header = base_cols + metric_cols
-    out_csv = "meas_sweep.csv"
-    with open(out_csv, "w", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=header)
-        w.writeheader()
-        for r in csv_rows:
-            for m in metric_cols:
-                if m not in r:
-                    r[m] = ""
-            w.writerow(r)
+    out_csv = sweep_csv_name(gate, vdd)
+    write_meas_csv(csv_rows, all_metric_names, out_csv)
+    record_csv(deps, out_csv, point_ids)
     print(f"\nSaved CSV: {out_csv}")
 
     # plots of delay vs Cload
     for metric_name, temp_map in metric_points_by_temp.items():
-        plot_delay_vs_cload(temp_map, metric_name)
+        for tempC, fname in plot_delay_vs_cload(temp_map, metric_name, sweep_tag(gate, vdd)):
+            record_plot(deps, fname, metric_name, tempC, point_ids, sweep_tag(gate, vdd))
+    save_deps(deps)
     print("Generated delay-vs-Cload plots.")
 
 TEMP_RE = re.compile(r"-?\d+")
@@ -167,7 +150,8 @@ if not Path(MODEL_PATH).exists():
         f"Model file not found: {MODEL_PATH}\n"
         "Place 45nm_LP.pm next to this script or update MODEL_PATH."
     )
-MODEL_INCLUDE = f'.include "{MODEL_PATH}"'
+# absolute, so decks also work when ngspice runs inside a scratch workspace
+MODEL_INCLUDE = f'.include "{Path(MODEL_PATH).resolve()}"'
 
 # ========== (Optional) Gemini for parsing ==========
 USE_GEMINI = False
@@ -180,7 +164,12 @@ try:
 except Exception:
     USE_GEMINI = False
 
-# ========== Gate templates (now file names include {cap_tag}) ==========
+# ========== Gate templates (file names include {run_tag}: gate, VDD, temp, load) ==========
+# Transistor widths are {wn}/{wp}; DEFAULT_SIZES is (Wn, Wp) in um.
+DEFAULT_SIZES = (1.0, 2.0)
+# (NMOS count, PMOS count) per gate, for area = L * (n*Wn + p*Wp)
+GATE_DEVICES = {"inverter": (1, 1), "nand2": (2, 2), "nor2": (2, 2)}
+
 TEMPLATES = {
     "inverter": """
 * CMOS inverter (PTM 45nm)
@@ -188,8 +177,8 @@ Vdd vdd 0 dc {vdd}
 Vin in  0 pulse(0 {vdd} 1n 20p 20p 1n 2n)
 
 * D G S B
-Mn out in  0   0   nmos W=1u L=45n
-Mp out in  vdd vdd pmos W=2u L=45n
+Mn out in  0   0   nmos W={wn} L=45n
+Mp out in  vdd vdd pmos W={wp} L=45n
 
 {load_cap}
 
@@ -199,6 +188,9 @@ Mp out in  vdd vdd pmos W=2u L=45n
 .control
   let v50 = {vdd}/2
   set filetype=ascii
+  * wrdata: one time column plus a name header, for the Python readers
+  set wr_singlescale
+  set wr_vecnames
 
   tran 1p 6n
   run
@@ -213,10 +205,10 @@ Mp out in  vdd vdd pmos W=2u L=45n
   print tPLH_ps
   print tPHL_ps
   set appendwrite
-  wrdata meas_ps_{temperature}C_{cap_tag}.dat tPLH_ps tPHL_ps
+  wrdata meas_ps_{run_tag}.dat tPLH_ps tPHL_ps
 
   * ASCII dump for Python plotting (includes time as first column)
-  wrdata sim_{temperature}C_{cap_tag}.dat time v(in) v(out)
+  wrdata sim_{run_tag}.dat time v(in) v(out)
 
   {plot_cmd}
 .endc
@@ -231,10 +223,10 @@ Vin1 in1 0 pulse(0 {vdd} 1n 10p 10p 200p 2000p)
 Vin2 in2 0 {vdd}
 
 * D  G   S  B
-Mn1 out in1 n1  0   nmos W=1u L=45n
-Mn2 n1  in2 0   0   nmos W=1u L=45n
-Mp1 out in1 vdd vdd pmos W=2u L=45n
-Mp2 out in2 vdd vdd pmos W=2u L=45n
+Mn1 out in1 n1  0   nmos W={wn} L=45n
+Mn2 n1  in2 0   0   nmos W={wn} L=45n
+Mp1 out in1 vdd vdd pmos W={wp} L=45n
+Mp2 out in2 vdd vdd pmos W={wp} L=45n
 
 {load_cap}
 
@@ -244,6 +236,9 @@ Mp2 out in2 vdd vdd pmos W=2u L=45n
 .control
   let v50 = {vdd}/2
   set filetype=ascii
+  * wrdata: one time column plus a name header, for the Python readers
+  set wr_singlescale
+  set wr_vecnames
 
   tran 1p 6n
   run
@@ -258,9 +253,9 @@ Mp2 out in2 vdd vdd pmos W=2u L=45n
   print tPHL_in1_ps
   print tPLH_in1_ps
   set appendwrite
-  wrdata meas_ps_{temperature}C_{cap_tag}.dat tPHL_in1_ps tPLH_in1_ps
+  wrdata meas_ps_{run_tag}.dat tPHL_in1_ps tPLH_in1_ps
 
-  wrdata sim_{temperature}C_{cap_tag}.dat time v(in1) v(in2) v(out)
+  wrdata sim_{run_tag}.dat time v(in1) v(in2) v(out)
 
   {plot_cmd}
 .endc
@@ -275,10 +270,10 @@ Vin1 in1 0 pulse(0 {vdd} 1n 10p 10p 200p 2000p)
 Vin2 in2 0 0
 
 * D  G   S  B
-Mn1 out in1 0   0   nmos W=1u L=45n
-Mn2 out in2 0   0   nmos W=1u L=45n
-Mp1 out in1 vdd vdd pmos W=2u L=45n
-Mp2 out in2 vdd vdd pmos W=2u L=45n
+Mn1 out in1 0   0   nmos W={wn} L=45n
+Mn2 out in2 0   0   nmos W={wn} L=45n
+Mp1 out in1 vdd vdd pmos W={wp} L=45n
+Mp2 out in2 vdd vdd pmos W={wp} L=45n
 
 {load_cap}
 
@@ -288,6 +283,9 @@ Mp2 out in2 vdd vdd pmos W=2u L=45n
 .control
   let v50 = {vdd}/2
   set filetype=ascii
+  * wrdata: one time column plus a name header, for the Python readers
+  set wr_singlescale
+  set wr_vecnames
 
   tran 1p 6n
   run
@@ -301,9 +299,9 @@ Mp2 out in2 vdd vdd pmos W=2u L=45n
   print tPLH_in1_ps
   print tPHL_in1_ps
   set appendwrite
-  wrdata meas_ps_{temperature}C_{cap_tag}.dat tPLH_in1_ps tPHL_in1_ps
+  wrdata meas_ps_{run_tag}.dat tPLH_in1_ps tPHL_in1_ps
 
-  wrdata sim_{temperature}C_{cap_tag}.dat time v(in1) v(in2) v(out)
+  wrdata sim_{run_tag}.dat time v(in1) v(in2) v(out)
 
   {plot_cmd}
 .endc
@@ -418,10 +416,10 @@ def parse_meas(stdout_text: str):
                 out[m.group(1)] = m.group(2)
     return out
 
-def parse_meas_dat():
+def parse_meas_dat(path="meas.dat"):
     out = {}
-    if not os.path.exists("meas.dat"): return out
-    with open("meas.dat","r") as f:
+    if not os.path.exists(path): return out
+    with open(path,"r") as f:
         for line in f:
             m = MEAS_STDOUT_RE.match(line)
             if m:
@@ -481,7 +479,19 @@ def normalize_params(parsed: dict, prompt_text: str) -> dict:
     }
 
 # ========== Build & Run ==========
-def build_netlist(gate: str, vdd: float, temp_c: int, load_cap_line: str, cap_tag: str, interactive: bool) -> str:
+def sweep_tag(gate, vdd):
+    """Per-(gate, VDD) tag shared by every output file of one sweep, e.g. 'nand2_0.8V'."""
+    return f"{gate}_{float(vdd):g}V"
+
+def point_run_tag(gate, vdd, temp_c, cap_tag):
+    return f"{sweep_tag(gate, vdd)}_{int(temp_c)}C_{cap_tag}"
+
+def sweep_csv_name(gate, vdd):
+    return f"meas_sweep_{sweep_tag(gate, vdd)}.csv"
+
+def build_netlist(gate: str, vdd: float, temp_c: int, load_cap_line: str, cap_tag: str, interactive: bool,
+                  sizes=None) -> str:
+    wn, wp = sizes or DEFAULT_SIZES
     if interactive:
         plot_vecs = "v(in) v(out)" if gate == "inverter" else "v(in1) v(out)"
         plot_cmd = f"plot {plot_vecs}"
@@ -493,11 +503,18 @@ def build_netlist(gate: str, vdd: float, temp_c: int, load_cap_line: str, cap_ta
         load_cap=load_cap_line,
         model_include=MODEL_INCLUDE,
         plot_cmd=plot_cmd,
-        cap_tag=cap_tag
+        run_tag=point_run_tag(gate, vdd, temp_c, cap_tag),
+        wn=f"{wn:g}u",
+        wp=f"{wp:g}u"
     )
 
-def run_ngspice(netlist_text: str, filename: str, interactive: bool):
-    with open(filename, "w") as f:
+def run_ngspice(netlist_text: str, filename: str, interactive: bool, cwd=None, ws=None):
+    """
+    Write the deck and run ngspice; with `cwd`, everything happens in that directory.
+    A non-zero ngspice exit is reported to `ws` (a Workspace) so the run is not treated as clean.
+    """
+    run_dir = cwd or "."
+    with open(os.path.join(run_dir, filename), "w") as f:
         f.write(netlist_text)
 
     if interactive:
@@ -505,18 +522,316 @@ def run_ngspice(netlist_text: str, filename: str, interactive: bool):
         print("ngspice launched (interactive). Close the plot window to end the run.")
         return {}
 
-    cp = subprocess.run(["ngspice", "-b", filename], capture_output=True, text=True)
+    cp = subprocess.run(["ngspice", "-b", filename], capture_output=True, text=True, cwd=cwd)
 
-    with open("ngspice_stdout.txt","a") as f: f.write(f"\n[{filename}]\n{cp.stdout}\n")
-    with open("ngspice_stderr.txt","a") as f: f.write(f"\n[{filename}]\n{cp.stderr}\n")
+    with open(os.path.join(run_dir, "ngspice_stdout.txt"),"a") as f: f.write(f"\n[{filename}]\n{cp.stdout}\n")
+    with open(os.path.join(run_dir, "ngspice_stderr.txt"),"a") as f: f.write(f"\n[{filename}]\n{cp.stderr}\n")
+    if cp.returncode != 0:
+        print(f"  ngspice exited with status {cp.returncode} for {filename} (see ngspice_stderr.txt)")
+        if ws is not None:
+            ws.note_failure(filename, f"ngspice exit {cp.returncode}")
 
     meas = parse_meas(cp.stdout)
     if not meas:
-        meas = parse_meas_dat()
+        meas = parse_meas_dat(os.path.join(run_dir, "meas.dat"))
     return meas
 
+# ---------- Streaming waveform readers (bounded memory) ----------
+# Long transients produce wrdata/rawfile outputs far larger than RAM; these
+# readers yield fixed-size NumPy blocks (rows x requested columns) so that
+# measurements and plots never hold more than one block at a time.
+WAVE_BLOCK_ROWS = 65536
+
+def _column_index(names, name):
+    """Last column called `name` (case-insensitive), or None."""
+    hits = [i for i, n in enumerate(names) if n.lower() == name.lower()]
+    return hits[-1] if hits else None
+
+def _parse_wrdata_rows(lines, idx):
+    import numpy as np
+    try:
+        return np.loadtxt(lines, usecols=idx, ndmin=2)
+    except (ValueError, IndexError):
+        # slow path: drop unparsable lines, like the old line-by-line reader
+        rows = []
+        for ln in lines:
+            parts = ln.split()
+            try:
+                rows.append([float(parts[i]) for i in idx])
+            except (ValueError, IndexError):
+                continue
+        return np.array(rows, dtype=float).reshape(-1, len(idx))
+
+def iter_wrdata_blocks(dat_path, columns, block_rows=WAVE_BLOCK_ROWS):
+    """Yield (n, len(columns)) float arrays from an ASCII wrdata file with a name header."""
+    with open(dat_path, "r") as f:
+        head = []
+        for ln in f:
+            if ln.strip():
+                head.append(ln.strip())
+                if len(head) == 20:
+                    break
+        if not head:
+            return
+        header_idx = next((i for i, ln in enumerate(head) if "time" in ln.lower()), 0)
+        names = re.split(r"\s+", head[header_idx])
+        idx = [_column_index(names, c) for c in columns]
+        if None in idx:
+            raise KeyError(f"{dat_path}: missing column(s) {[c for c, i in zip(columns, idx) if i is None]}")
+
+        lines = itertools.chain(head[header_idx+1:], (ln for ln in f if ln.strip()))
+        while True:
+            chunk = list(itertools.islice(lines, block_rows))
+            if not chunk:
+                break
+            block = _parse_wrdata_rows(chunk, idx)
+            if len(block):
+                yield block
+
+def iter_rawfile_blocks(raw_path, columns, block_rows=WAVE_BLOCK_ROWS):
+    """Yield (n, len(columns)) float arrays from an ngspice rawfile (binary or ASCII values)."""
+    import numpy as np
+    with open(raw_path, "rb") as f:
+        n_vars = n_points = None
+        is_complex = False
+        names = []
+        section = None
+        for raw_line in f:
+            text = raw_line.decode("latin-1").strip()
+            key = text.split(":", 1)[0].strip().lower()
+            if key == "flags":
+                is_complex = "complex" in text.lower()
+            elif key == "no. variables":
+                n_vars = int(text.split(":", 1)[1])
+            elif key == "no. points":
+                n_points = int(text.split(":", 1)[1])
+            elif key == "variables":
+                for _ in range(n_vars):
+                    names.append(f.readline().decode("latin-1").split()[1])
+            elif key in ("binary", "values"):
+                section = key
+                break
+        if section is None or not n_vars:
+            return
+        idx = [_column_index(names, c) for c in columns]
+        if None in idx:
+            raise KeyError(f"{raw_path}: missing column(s) {[c for c, i in zip(columns, idx) if i is None]}")
+
+        if section == "binary":
+            dtype = np.dtype(np.complex128 if is_complex else np.float64)
+            remaining = n_points if n_points is not None else float("inf")
+            while remaining > 0:
+                n = int(min(block_rows, remaining))
+                data = np.frombuffer(f.read(n * n_vars * dtype.itemsize), dtype=dtype)
+                rows = len(data) // n_vars
+                if rows == 0:
+                    break
+                block = data[:rows * n_vars].reshape(rows, n_vars)[:, idx]
+                yield block.real.astype(float) if is_complex else block
+                remaining -= rows
+            return
+
+        # ASCII "Values:": "<point> <var0>" then one line per remaining variable
+        rows, cur = [], []
+        for raw_line in f:
+            parts = raw_line.decode("latin-1").split()
+            if not parts:
+                continue
+            if len(parts) == 2:
+                cur = []
+            cur.append(float(parts[-1].split(",")[0]))
+            if len(cur) == n_vars:
+                rows.append([cur[i] for i in idx])
+                if len(rows) == block_rows:
+                    yield np.array(rows)
+                    rows = []
+        if rows:
+            yield np.array(rows)
+
+def iter_waveform_blocks(path, columns, block_rows=WAVE_BLOCK_ROWS):
+    reader = iter_rawfile_blocks if str(path).lower().endswith(".raw") else iter_wrdata_blocks
+    return reader(path, columns, block_rows)
+
+class CrossingMeter:
+    """Time of the nth `edge` ('rise'/'fall') crossing of `level` after `td`, fed block by block."""
+    def __init__(self, level, edge, nth=1, td=0.0):
+        self.level = level
+        self.rise = edge == "rise"
+        self.nth = nth
+        self.td = td
+        self.count = 0
+        self.time = None
+        self._prev = None  # last (t, y) of the previous block, to catch crossings on the seam
+
+    def update(self, t, y):
+        import numpy as np
+        if self.time is not None or not len(t):
+            return
+        if self._prev is not None:
+            t = np.concatenate(([self._prev[0]], t))
+            y = np.concatenate(([self._prev[1]], y))
+        self._prev = (t[-1], y[-1])
+        d = y - self.level
+        if self.rise:
+            hits = np.nonzero((d[:-1] < 0) & (d[1:] >= 0))[0]
+        else:
+            hits = np.nonzero((d[:-1] > 0) & (d[1:] <= 0))[0]
+        tc = t[hits] + (self.level - y[hits]) * (t[hits+1] - t[hits]) / (y[hits+1] - y[hits])
+        tc = tc[tc >= self.td]
+        need = self.nth - self.count
+        if len(tc) >= need:
+            self.time = float(tc[need-1])
+        else:
+            self.count += len(tc)
+
+class RunningIntegral:
+    """Trapezoidal scale * integral of y dt, fed block by block; `.mean` is the time average."""
+    def __init__(self, scale=1.0):
+        self.scale = scale
+        self.total = 0.0
+        self.t_first = None
+        self._prev = None
+
+    def update(self, t, y):
+        import numpy as np
+        if not len(t):
+            return
+        if self._prev is not None:
+            t = np.concatenate(([self._prev[0]], t))
+            y = np.concatenate(([self._prev[1]], y))
+        elif self.t_first is None:
+            self.t_first = float(t[0])
+        self._prev = (float(t[-1]), float(y[-1]))
+        self.total += float(np.sum((y[1:] + y[:-1]) * np.diff(t)) / 2.0)
+
+    @property
+    def value(self):
+        return self.scale * self.total
+
+    @property
+    def mean(self):
+        if self._prev is None or self._prev[0] == self.t_first:
+            return None
+        return self.total / (self._prev[0] - self.t_first)
+
+class MinMaxDecimator:
+    """
+    Keeps at most ~max_points buckets per channel, each holding its min and max
+    sample together with the times they occurred.  When full, adjacent buckets are
+    merged and the stride doubles, so memory stays bounded however long the
+    waveform is.
+    """
+    def __init__(self, max_points=4000):
+        self.max_points = max_points
+        self.stride = 1
+        self.parts = None  # [t_min, y_min, t_max, y_max], each (buckets, channels)
+        self._carry = None
+
+    def update(self, block):
+        import numpy as np
+        if self._carry is not None:
+            block = np.concatenate((self._carry, block))
+        n = len(block) // self.stride * self.stride
+        self._carry = block[n:]
+        if n:
+            self._append(block[:n].reshape(-1, self.stride, block.shape[1]))
+        while self.parts is not None and len(self.parts[0]) > self.max_points:
+            self._merge()
+
+    def _append(self, groups):
+        import numpy as np
+        t, y = groups[:, :, 0], groups[:, :, 1:]
+        rows = np.arange(len(groups))[:, np.newaxis]
+        imin, imax = y.argmin(axis=1), y.argmax(axis=1)
+        new = [t[rows, imin], y.min(axis=1), t[rows, imax], y.max(axis=1)]
+        self.parts = new if self.parts is None else [np.concatenate((a, b)) for a, b in zip(self.parts, new)]
+
+    def _merge(self):
+        import numpy as np
+        t_lo, lo, t_hi, hi = self.parts
+        m = len(lo) // 2 * 2
+        take_b_lo = lo[1:m:2] < lo[0:m:2]
+        take_b_hi = hi[1:m:2] > hi[0:m:2]
+        pick = lambda cond, x: np.concatenate((np.where(cond, x[1:m:2], x[0:m:2]), x[m:]))
+        self.parts = [pick(take_b_lo, t_lo), pick(take_b_lo, lo), pick(take_b_hi, t_hi), pick(take_b_hi, hi)]
+        self.stride *= 2
+
+    def finish(self):
+        """Returns [(t, y) per channel]; each bucket contributes its min and max in time order."""
+        import numpy as np
+        if self._carry is not None and len(self._carry):
+            self._append(self._carry[np.newaxis, :, :])
+            self._carry = None
+        if self.parts is None:
+            return []
+        t_lo, lo, t_hi, hi = self.parts
+        series = []
+        for c in range(lo.shape[1]):
+            min_first = t_lo[:, c] <= t_hi[:, c]
+            t = np.column_stack((np.where(min_first, t_lo[:, c], t_hi[:, c]),
+                                 np.where(min_first, t_hi[:, c], t_lo[:, c]))).ravel()
+            y = np.column_stack((np.where(min_first, lo[:, c], hi[:, c]),
+                                 np.where(min_first, hi[:, c], lo[:, c]))).ravel()
+            series.append((t, y))
+        return series
+
+# Streaming equivalents of the .meas lines in TEMPLATES:
+# name -> (trig edge on the input, targ edge on v(out), targ TD)
+STREAM_MEAS = {
+    "inverter": {"tPLH": ("fall", "rise", 0.9e-9), "tPHL": ("rise", "fall", 0.9e-9)},
+    "nand2": {"tPHL_in1": ("rise", "fall", 0.9e-9), "tPLH_in1": ("fall", "rise", 1.1e-9)},
+    "nor2": {"tPLH_in1": ("fall", "rise", 0.9e-9), "tPHL_in1": ("rise", "fall", 1.1e-9)},
+}
+
+def gate_meas_specs(gate, vdd):
+    in_name = "v(in)" if gate == "inverter" else "v(in1)"
+    return {name: ("delay", in_name, trig, "v(out)", targ, vdd / 2.0, td)
+            for name, (trig, targ, td) in STREAM_MEAS[gate].items()}
+
+def stream_measure(path, specs, block_rows=WAVE_BLOCK_ROWS):
+    """
+    Evaluate measurements over a waveform file one block at a time.
+    specs: name -> ("delay", trig_col, trig_edge, targ_col, targ_edge, level, targ_td)
+                 | ("avg", col) | ("integral", col, scale)
+    Returns name -> value in seconds / volts / scaled units (delays that never occur are omitted).
+    """
+    columns = ["time"]
+    for spec in specs.values():
+        cols = (spec[1], spec[3]) if spec[0] == "delay" else (spec[1],)
+        columns += [c for c in cols if c not in columns]
+    col = {c: i for i, c in enumerate(columns)}
+
+    meters = {}
+    for name, spec in specs.items():
+        if spec[0] == "delay":
+            _, trig_col, trig_edge, targ_col, targ_edge, level, td = spec
+            meters[name] = (CrossingMeter(level, trig_edge), CrossingMeter(level, targ_edge, td=td))
+        else:
+            meters[name] = RunningIntegral(spec[2] if spec[0] == "integral" else 1.0)
+
+    for block in iter_waveform_blocks(path, columns, block_rows):
+        t = block[:, 0]
+        for name, spec in specs.items():
+            if spec[0] == "delay":
+                meters[name][0].update(t, block[:, col[spec[1]]])
+                meters[name][1].update(t, block[:, col[spec[3]]])
+            else:
+                meters[name].update(t, block[:, col[spec[1]]])
+
+    out = {}
+    for name, spec in specs.items():
+        if spec[0] == "delay":
+            trig, targ = meters[name]
+            if trig.time is not None and targ.time is not None:
+                out[name] = targ.time - trig.time
+        elif spec[0] == "avg":
+            out[name] = meters[name].mean
+        else:
+            out[name] = meters[name].value
+    return out
+
 # ---------- PNG from wrdata ----------
-def plot_from_wrdata(dat_path: str, png_path: str, gate: str):
+def plot_from_wrdata(dat_path: str, png_path: str, gate: str, max_points: int = 4000):
     import matplotlib
     matplotlib.use("Agg")
     import matplotlib.pyplot as plt
@@ -524,51 +839,24 @@ def plot_from_wrdata(dat_path: str, png_path: str, gate: str):
     if not os.path.exists(dat_path):
         return False
 
-    with open(dat_path, "r") as f:
-        lines = [ln.strip() for ln in f if ln.strip()]
-
-    header_idx = None
-    for i, ln in enumerate(lines[:20]):
-        if "time" in ln.lower():
-            header_idx = i
-            break
-    if header_idx is None:
-        header_idx = 0
-
-    header = re.split(r"\s+", lines[header_idx])
-    cols = {name: idx for idx, name in enumerate(header)}
-
     in_name = "v(in)" if gate == "inverter" else "v(in1)"
     out_name = "v(out)"
 
-    def find_col(name):
-        for k, idx in cols.items():
-            if k.lower() == name.lower():
-                return idx
-        return None
-
-    ti = find_col("time")
-    ii = find_col(in_name)
-    oi = find_col(out_name)
-    if ti is None or ii is None or oi is None:
+    # decimate while streaming so long transients never sit in memory
+    dec = MinMaxDecimator(max_points)
+    try:
+        for block in iter_waveform_blocks(dat_path, ["time", in_name, out_name]):
+            dec.update(block)
+    except KeyError:
         return False
-
-    times, vin, vout = [], [], []
-    for ln in lines[header_idx+1:]:
-        parts = re.split(r"\s+", ln)
-        try:
-            times.append(float(parts[ti]))
-            vin.append(float(parts[ii]))
-            vout.append(float(parts[oi]))
-        except Exception:
-            continue
-
-    if not times:
+    series = dec.finish()
+    if not series:
         return False
+    (t_in, vin), (t_out, vout) = series
 
     plt.figure(figsize=(10, 5))
-    plt.plot(times, vin, label=in_name)
-    plt.plot(times, vout, label=out_name)
+    plt.plot(t_in, vin, label=in_name)
+    plt.plot(t_out, vout, label=out_name)
     plt.xlabel("Time (s)")
     plt.ylabel("Voltage (V)")
     plt.title(Path(png_path).stem)
@@ -593,15 +881,17 @@ def to_jpg(png_path: str, jpg_path: str):
         return False
 
 # ==== NEW: helper to plot delay vs Cload for each temp/metric
-def plot_delay_vs_cload(temp_to_metric_points, metric_name):
+def plot_delay_vs_cload(temp_to_metric_points, metric_name, tag=""):
     """
     temp_to_metric_points: dict[tempC] -> list of (C_fF, delay_ps)
-    Writes 'delay_vs_Cload_{metric}_{temp}C.png' files.
+    Writes 'delay_vs_Cload_{tag}_{metric}_{temp}C.png' files (tag = sweep_tag(gate, vdd)).
+    Returns list of (tempC, filename) actually written.
     """
     import matplotlib
     matplotlib.use("Agg")
     import matplotlib.pyplot as plt
 
+    written = []
     for tempC, points in temp_to_metric_points.items():
         pts = sorted([(c, d) for (c, d) in points if c is not None and d is not None], key=lambda x: x[0])
         if not pts:
@@ -613,24 +903,755 @@ def plot_delay_vs_cload(temp_to_metric_points, metric_name):
         plt.plot(xs, ys, marker="o")
         plt.xlabel("C_load (fF)")
         plt.ylabel(f"{metric_name} (ps)")
-        plt.title(f"{metric_name} vs C_load @ {tempC}°C")
+        plt.title(f"{tag + ' ' if tag else ''}{metric_name} vs C_load @ {tempC}°C")
         plt.tight_layout()
-        fname = f"delay_vs_Cload_{metric_name}_{tempC}C.png"
+        fname = f"delay_vs_Cload_{tag + '_' if tag else ''}{metric_name}_{tempC}C.png"
         plt.savefig(fname, dpi=150)
         plt.close()
+        written.append((tempC, fname))
+    return written
+
+# ---------- Scratch workspace (decks + raw ngspice outputs) ----------
+SCRATCH_DEFAULT = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+ARTIFACT_KINDS = ("deck", "dat", "meas", "log")
+
+def artifact_kind(name):
+    if name.endswith(".cir"): return "deck"
+    if name.startswith("meas_ps_") or name == "meas.dat": return "meas"
+    if name.startswith("sim_"): return "dat"
+    if name.startswith("ngspice_"): return "log"
+    return None
+
+class Workspace:
+    """
+    Per-run scratch directory for decks and raw ngspice outputs (root=None keeps
+    the old behaviour of writing into the CWD).  The requested artifact kinds are
+    packed into one artifacts_{label}.tar.gz in the CWD.  The directory is removed
+    only if the run was clean: no exception, no non-zero ngspice exit and no point
+    without measurements (see note_failure); otherwise it is left for debugging.
+    """
+    def __init__(self, label, root=None, keep=()):
+        self.label = label
+        self.root = root
+        self.keep = set(keep)
+        self.path = None
+        self.failures = {}  # deck -> first reason
+
+    def __enter__(self):
+        if self.root is not None:
+            self.path = tempfile.mkdtemp(prefix=f"agent_{self.label}_", dir=self.root)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self.path is None:
+            return False
+        if exc_type is not None:
+            print(f"[workspace] Run failed; scratch files kept in {self.path}")
+            return False
+        self.bundle()
+        if self.failures:
+            deck, reason = next(iter(self.failures.items()))
+            print(f"[workspace] {len(self.failures)} point(s) failed "
+                  f"(first: {deck}: {reason}); scratch files kept in {self.path}")
+            return False
+        shutil.rmtree(self.path, ignore_errors=True)
+        self.path = None
+        return False
+
+    def note_failure(self, deck, reason):
+        self.failures.setdefault(deck, reason)
+
+    def file(self, name):
+        return os.path.join(self.path, name) if self.path else name
+
+    def kept(self, outputs):
+        """Subset of outputs that outlive the workspace (i.e. not in scratch)."""
+        if self.path is None:
+            return dict(outputs)
+        return {k: v for k, v in outputs.items() if not v.startswith(self.path + os.sep)}
+
+    def bundle(self):
+        members = [n for n in sorted(os.listdir(self.path)) if artifact_kind(n) in self.keep]
+        if not members:
+            return None
+        out = f"artifacts_{self.label}.tar.gz"
+        with tarfile.open(out, "w:gz") as tar:
+            for n in members:
+                tar.add(os.path.join(self.path, n), arcname=n)
+        print(f"[workspace] Bundled {len(members)} artifacts: {out}")
+        return out
+
+def make_workspace(args, label):
+    root = None if args.no_scratch else args.scratch
+    return Workspace(f"{label}_{time.strftime('%Y%m%d-%H%M%S')}", root=root, keep=args.keep)
+
+# ---------- One sweep point: deck -> ngspice -> measurements (ps) ----------
+def size_tag(sizes):
+    """(1.2, 2.5) -> 'wn1p2u_wp2p5u' (file-name safe)."""
+    return "_".join(f"{n}{w:g}u".replace(".", "p") for n, w in zip(("wn", "wp"), sizes))
+
+def simulate_point(gate, vdd, temp_c, load_text, single_load_line, ws=None, sizes=None):
+    """
+    Build and run one (gate, vdd, temp, load) point in batch mode.
+    Decks and raw outputs go into `ws` (a Workspace) when given, else the CWD.
+    `sizes` = (Wn, Wp) in um overrides DEFAULT_SIZES and is added to file names.
+    Returns (meas_ps, outputs) where outputs maps 'deck'/'dat'/'meas'/'png' to paths.
+    """
+    load_line = f"Cl out 0 {load_text}" if load_text else single_load_line
+    cap_tag = sanitize_cap_for_tag(load_text) if load_text else "noC"
+    if sizes:
+        cap_tag = f"{cap_tag}_{size_tag(sizes)}"
+
+    net = build_netlist(gate, vdd, int(temp_c), load_line, cap_tag, interactive=False, sizes=sizes)
+    in_ws = ws.file if ws else (lambda name: name)
+    run_tag = point_run_tag(gate, vdd, temp_c, cap_tag)
+    deck = f"agent_run_{run_tag}.cir"
+    outputs = {
+        "deck": in_ws(deck),
+        "dat": in_ws(f"sim_{run_tag}.dat"),
+        "meas": in_ws(f"meas_ps_{run_tag}.dat"),
+        "png": f"agent_run_{run_tag}.png",
+    }
+    # the decks `set appendwrite`, so stale files would accumulate earlier runs
+    for k in ("dat", "meas"):
+        if os.path.exists(outputs[k]):
+            os.remove(outputs[k])
+    meas = run_ngspice(net, deck, interactive=False, cwd=ws.path if ws else None, ws=ws)
+    if not meas and os.path.exists(outputs["dat"]):
+        # ngspice printed nothing we could parse: measure the waveform ourselves
+        try:
+            meas = stream_measure(outputs["dat"], gate_meas_specs(gate, vdd))
+        except (KeyError, ImportError):
+            meas = {}
+    meas_ps = meas_to_ps(meas) if meas else {}
+    if not meas_ps and ws is not None:
+        ws.note_failure(deck, "no measurements")
+    return meas_ps, outputs
+
+def make_csv_row(gate, vdd, temp_c, load_text, meas_ps):
+    row = {
+        "gate": gate,
+        "vdd_V": vdd,
+        "temp_C": int(temp_c),
+        "load": load_text or "",
+        "load_fF": cap_text_to_fF(load_text) if load_text else ""
+    }
+    for k, v in meas_ps.items():
+        # k might be 'tPLH', 'tPHL', 'tPLH_in1', ...
+        row[k] = float(v) if v is not None else ""
+    return row
+
+def write_meas_csv(csv_rows, metric_names, out_csv):
+    base_cols = ["gate", "vdd_V", "temp_C", "load", "load_fF"]
+    metric_cols = sorted(metric_names)  # stable order
+    header = base_cols + metric_cols
+    with open(out_csv, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=header)
+        w.writeheader()
+        for r in csv_rows:
+            # ensure missing metric keys exist with blank
+            for m in metric_cols:
+                if m not in r:
+                    r[m] = ""
+            w.writerow(r)
+
+# ---------- Dependency graph (incremental re-simulation) ----------
+# agent_deps.json records, for every simulated point, the hashes of its inputs
+# (model file, gate template) with its parameters and the files it produced, plus
+# which points feed each CSV and each delay-vs-Cload plot.  `--mode rerun --stale`
+# uses it to re-simulate only invalidated points and rebuild only affected outputs.
+DEPS_PATH = "agent_deps.json"
+
+def sha256_text(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def sha256_file(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def point_id(gate, vdd, temp_c, load_text, sizes=None):
+    pid = f"{gate}|{float(vdd):g}|{int(temp_c)}|{load_text or ''}"
+    if sizes:
+        pid += f"|{sizes[0]:g}u/{sizes[1]:g}u"
+    return pid
+
+def load_deps(path=DEPS_PATH):
+    if not os.path.exists(path):
+        return {"points": {}, "csvs": {}, "plots": {}}
+    with open(path, "r") as f:
+        return json.load(f)
+
+def save_deps(deps, path=DEPS_PATH):
+    with open(path, "w") as f:
+        json.dump(deps, f, indent=1, sort_keys=True)
+
+def record_point(deps, gate, vdd, temp_c, load_text, single_load_line, meas_ps, outputs, sizes=None,
+                 model_hash=None):
+    """Store/refresh one point node; returns its id. Pass `model_hash` to avoid re-hashing per point."""
+    params = {
+        "gate": gate,
+        "vdd": float(vdd),
+        "temp_C": int(temp_c),
+        "load": load_text or "",
+        "load_line": single_load_line if not load_text else "",
+    }
+    if sizes:
+        params["sizes"] = [float(sizes[0]), float(sizes[1])]
+    pid = point_id(gate, vdd, temp_c, load_text, sizes)
+    deps["points"][pid] = {
+        **params,
+        "model_hash": model_hash or sha256_file(MODEL_PATH),
+        "template_hash": sha256_text(TEMPLATES[gate]),
+        "outputs": {k: v for k, v in outputs.items() if os.path.exists(v)},
+        "meas_ps": meas_ps,
+    }
+    return pid
+
+def record_csv(deps, csv_path, point_ids):
+    deps["csvs"][csv_path] = {"points": list(point_ids)}
+
+def record_plot(deps, png_path, metric_name, temp_c, point_ids, tag=""):
+    pids = [p for p in point_ids if deps["points"][p]["temp_C"] == int(temp_c)]
+    deps["plots"][png_path] = {"metric": metric_name, "temp_C": int(temp_c), "tag": tag, "points": pids}
+
+def point_is_stale(node, model_hash):
+    # a point that measured nothing (ngspice failed) is never up to date
+    return (not node["meas_ps"]
+            or node["model_hash"] != model_hash
+            or node["template_hash"] != sha256_text(TEMPLATES[node["gate"]])
+            or not all(os.path.exists(p) for p in node["outputs"].values()))
+
+def cached_meas(deps, pid, model_hash):
+    """meas_ps recorded for `pid` if its inputs are unchanged and it measured something, else None."""
+    node = deps["points"].get(pid)
+    if node and node["meas_ps"] and node["gate"] in TEMPLATES and not point_is_stale(node, model_hash):
+        return node["meas_ps"]
+    return None
+
+def output_points(deps):
+    """
+    Ids of points that feed a recorded CSV or plot, in graph order.  Points only
+    cached by the sizing optimizer or compare mode are left out.
+    """
+    owned = set()
+    for node in list(deps["csvs"].values()) + list(deps["plots"].values()):
+        owned.update(node["points"])
+    return [pid for pid in deps["points"] if pid in owned]
+
+def stale_points(deps):
+    """Ids of output points that failed, whose model/template hash changed or whose recorded outputs are gone."""
+    model_hash = sha256_file(MODEL_PATH)
+    stale = []
+    for pid in output_points(deps):
+        node = deps["points"][pid]
+        if node["gate"] not in TEMPLATES:
+            continue  # gate no longer exists; nothing we can rebuild
+        if point_is_stale(node, model_hash):
+            stale.append(pid)
+    return stale
+
+def rerun_from_deps(only_stale, jpg_flag, ws=None):
+    deps = load_deps()
+    if not deps["points"]:
+        print(f"No dependency graph found ({DEPS_PATH}); run a batch sweep first.")
+        return
+
+    todo = stale_points(deps) if only_stale else output_points(deps)
+    todo_gates = {deps["points"][p]["gate"] for p in todo}
+    for g in sorted({deps["points"][p]["gate"] for p in output_points(deps)} - todo_gates):
+        print(f"[rerun] {g}: up to date, skipped")
+    if not todo:
+        print("[rerun] Nothing to do.")
+        return
+
+    model_hash = sha256_file(MODEL_PATH)
+    for pid in todo:
+        node = deps["points"][pid]
+        print(f"\n[rerun] {pid} ...")
+        sizes = node.get("sizes")
+        meas_ps, outputs = simulate_point(node["gate"], node["vdd"], node["temp_C"], node["load"], node["load_line"],
+                                          ws, sizes)
+        if meas_ps:
+            print("  (ps):", pretty_ps(meas_ps))
+        if plot_from_wrdata(outputs["dat"], outputs["png"], node["gate"]) and jpg_flag:
+            to_jpg(outputs["png"], outputs["png"][:-len(".png")] + ".jpg")
+        record_point(deps, node["gate"], node["vdd"], node["temp_C"], node["load"], node["load_line"], meas_ps,
+                     ws.kept(outputs) if ws else outputs, sizes, model_hash=model_hash)
+
+    touched = set(todo)
+    for csv_path, node in deps["csvs"].items():
+        if touched.isdisjoint(node["points"]):
+            continue
+        rows, metric_names = [], set()
+        for pid in node["points"]:
+            pn = deps["points"][pid]
+            rows.append(make_csv_row(pn["gate"], pn["vdd"], pn["temp_C"], pn["load"], pn["meas_ps"]))
+            metric_names.update(pn["meas_ps"])
+        write_meas_csv(rows, metric_names, csv_path)
+        print(f"[rerun] Rebuilt CSV: {csv_path}")
+
+    for png_path, node in deps["plots"].items():
+        if touched.isdisjoint(node["points"]):
+            continue
+        pts = []
+        for pid in node["points"]:
+            pn = deps["points"][pid]
+            if node["metric"] in pn["meas_ps"]:
+                pts.append((cap_text_to_fF(pn["load"]) if pn["load"] else None, pn["meas_ps"][node["metric"]]))
+        if plot_delay_vs_cload({node["temp_C"]: pts}, node["metric"], node.get("tag", "")):
+            print(f"[rerun] Rebuilt plot: {png_path}")
+        elif os.path.exists(png_path):
+            os.remove(png_path)  # metric no longer measured at any load
+            print(f"[rerun] Removed plot with no data left: {png_path}")
+
+    save_deps(deps)
+
+# ---------- Transistor sizing optimizer ----------
+# Prompt: "size nand2 for tPHL < 20 ps at 20 fF, 110 C, minimize area".
+# Nelder-Mead over (Wn, Wp); each iteration's reflection/expansion/contraction
+# candidates are evaluated together in parallel, and every result goes through
+# the dependency graph, so re-running a search only simulates new sizes.
+SIZE_RANGE_UM = (0.1, 10.0)
+SIZE_GRID_UM = 0.01
+SIZE_GRID_DIGITS = 2  # decimals of SIZE_GRID_UM; snapped widths are rounded to it
+CONSTRAINT_RE = re.compile(r"\b(t_?p(?:hl|lh)(?:_in\d)?)\s*(<=?)\s*([0-9.]+)\s*ps", re.I)
+
+def parse_sizing_request(prompt: str):
+    """
+    Returns dict(gate, vdd, temperature, load, constraints, minimize_area) or None.
+    constraints maps metric ('tphl') -> (operator '<' or '<=', limit in ps).
+    """
+    if not re.search(r"\bsiz(?:e|ing)\b", prompt, re.I):
+        return None
+    constraints = {m.group(1).lower().replace("t_p", "tp"): (m.group(2), float(m.group(3)))
+                   for m in CONSTRAINT_RE.finditer(prompt)}
+    if not constraints:
+        return None
+    base = parse_with_rules(prompt)
+    m = re.search(r"(?:at|load)\s*[:=]?\s*([0-9]*\.?[0-9]+)\s*(ff|pf|nf)\b", prompt, re.I)
+    return {
+        "gate": base["gate"],
+        "vdd": base["vdd"],
+        "temperature": int(base["temperature"]),
+        "load": format_cap_for_netlist(f"{m.group(1)}{m.group(2)}") if m else "10fF",
+        "constraints": constraints,
+        "minimize_area": bool(re.search(r"minimi[sz]e\s+area", prompt, re.I)),
+    }
+
+def meets_constraint(delay_ps, constraint):
+    op, limit = constraint
+    return delay_ps <= limit if op == "<=" else delay_ps < limit
+
+def gate_area_um2(gate, sizes):
+    n, p = GATE_DEVICES[gate]
+    # L=0.045um adds three decimals to the grid widths; round off the float noise
+    return round(0.045 * (n * sizes[0] + p * sizes[1]), SIZE_GRID_DIGITS + 3)
+
+def snap_sizes(x):
+    lo, hi = SIZE_RANGE_UM
+    return tuple(round(round(min(max(v, lo), hi) / SIZE_GRID_UM) * SIZE_GRID_UM, SIZE_GRID_DIGITS) for v in x)
+
+def constrained_delays(meas_ps, constraints):
+    """Map each constraint ('tphl') to the measured value ('tPHL' or 'tPHL_in1')."""
+    out = {}
+    for name in constraints:
+        for k, v in meas_ps.items():
+            if k.lower() == name or k.lower().startswith(name + "_"):
+                out[name] = float(v)
+                break
+    return out
+
+def nelder_mead_batched(f_batch, x0, step, max_evals, should_stop=None, xtol=SIZE_GRID_UM):
+    """
+    2-D Nelder-Mead where f_batch(list_of_points) -> list_of_values.
+    The four candidate moves of each iteration are evaluated in one batch.
+    """
+    simplex = [tuple(x0), (x0[0] + step[0], x0[1]), (x0[0], x0[1] + step[1])]
+    vals = f_batch(simplex)
+    evals = len(simplex)
+    while evals < max_evals:
+        order = sorted(range(len(simplex)), key=lambda i: vals[i])
+        simplex = [simplex[i] for i in order]
+        vals = [vals[i] for i in order]
+        if should_stop and should_stop():
+            break
+        if max(abs(a - b) for x in simplex[1:] for a, b in zip(x, simplex[0])) < xtol:
+            break
+
+        c = [sum(x[d] for x in simplex[:-1]) / 2.0 for d in range(2)]
+        w = simplex[-1]
+        along = lambda k: tuple(c[d] + k * (c[d] - w[d]) for d in range(2))
+        xr, xe, xoc, xic = along(1.0), along(2.0), along(0.5), along(-0.5)
+        fr, fe, foc, fic = f_batch([xr, xe, xoc, xic])
+        evals += 4
+
+        if fr < vals[0]:
+            simplex[-1], vals[-1] = (xe, fe) if fe < fr else (xr, fr)
+        elif fr < vals[-2]:
+            simplex[-1], vals[-1] = xr, fr
+        elif fr < vals[-1] and foc <= fr:
+            simplex[-1], vals[-1] = xoc, foc
+        elif fr >= vals[-1] and fic < vals[-1]:
+            simplex[-1], vals[-1] = xic, fic
+        else:
+            best = simplex[0]
+            shrunk = [tuple(best[d] + 0.5 * (x[d] - best[d]) for d in range(2)) for x in simplex[1:]]
+            simplex[1:] = shrunk
+            vals[1:] = f_batch(shrunk)
+            evals += len(shrunk)
+    best = min(range(len(simplex)), key=lambda i: vals[i])
+    return simplex[best], vals[best]
+
+def pareto_front(points):
+    """points: list of dicts with 'delay_ps' and 'area_um2'; non-dominated subset sorted by area."""
+    front = []
+    best_delay = float("inf")
+    for p in sorted(points, key=lambda p: (p["area_um2"], p["delay_ps"])):
+        if p["delay_ps"] < best_delay:
+            front.append(p)
+            best_delay = p["delay_ps"]
+    return front
+
+def plot_pareto(evaluated, front, target_ps, png_path):
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
+    plt.figure(figsize=(7,4))
+    plt.scatter([p["area_um2"] for p in evaluated], [p["delay_ps"] for p in evaluated],
+                s=12, color="0.6", label="evaluated")
+    plt.plot([p["area_um2"] for p in front], [p["delay_ps"] for p in front],
+             marker="o", color="C0", label="Pareto front")
+    plt.axhline(target_ps, color="C3", linestyle="--", label="target")
+    plt.xlabel("Area (um^2)")
+    plt.ylabel("Worst constrained delay (ps)")
+    plt.title(Path(png_path).stem)
+    plt.legend()
+    plt.tight_layout()
+    plt.savefig(png_path, dpi=150)
+    plt.close()
+
+def optimize_sizing(req, ws=None, jobs=None, max_evals=60):
+    gate, vdd, temp_c, load = req["gate"], req["vdd"], req["temperature"], req["load"]
+    constraints = req["constraints"]
+    print(f"\n[sizing] {gate} @ VDD={vdd}V, {temp_c}C, Cload={load}; targets: "
+          + ", ".join(f"{k} {op} {limit:g} ps" for k, (op, limit) in constraints.items())
+          + ("; minimize area" if req["minimize_area"] else ""))
+
+    deps = load_deps()
+    model_hash = sha256_file(MODEL_PATH)
+    results = {}  # sizes -> meas_ps
+
+    def run(sizes):
+        return simulate_point(gate, vdd, temp_c, load, "", ws, sizes)
+
+    def evaluate(batch):
+        snapped = [snap_sizes(x) for x in batch]
+        todo = []
+        for sz in dict.fromkeys(snapped):
+            if sz in results:
+                continue
+            cached = cached_meas(deps, point_id(gate, vdd, temp_c, load, sz), model_hash)
+            if cached is not None:
+                results[sz] = cached
+            else:
+                todo.append(sz)
+        if todo:
+            with ThreadPoolExecutor(max_workers=jobs or os.cpu_count()) as ex:
+                for sz, (meas_ps, outputs) in zip(todo, ex.map(run, todo)):
+                    results[sz] = meas_ps
+                    record_point(deps, gate, vdd, temp_c, load, "", meas_ps,
+                                 ws.kept(outputs) if ws else outputs, sz, model_hash=model_hash)
+            save_deps(deps)
+        return [objective(sz) for sz in snapped]
+
+    def objective(sz):
+        delays = constrained_delays(results[sz], constraints)
+        if len(delays) < len(constraints):
+            return float("inf")  # measurement failed
+        area = gate_area_um2(gate, sz)
+        violation = sum(max(0.0, d / constraints[k][1] - 1.0) for k, d in delays.items())
+        if not req["minimize_area"]:
+            # just meet the targets: minimize the worst normalized delay
+            return max(d / constraints[k][1] for k, d in delays.items())
+        return area * (1.0 + 100.0 * violation)
+
+    def feasible(sz):
+        delays = constrained_delays(results[sz], constraints)
+        return len(delays) == len(constraints) and all(meets_constraint(d, constraints[k]) for k, d in delays.items())
+
+    # stop as soon as a sizing meets the targets, unless we are also minimizing area
+    should_stop = None if req["minimize_area"] else (lambda: any(feasible(sz) for sz in results))
+
+    x0 = DEFAULT_SIZES
+    best, _ = nelder_mead_batched(evaluate, x0, (0.5 * x0[0], 0.5 * x0[1]), max_evals, should_stop)
+    # the simplex minimizes a penalised objective; report the smallest sizing that
+    # actually meets the targets, and the simplex vertex only if none does
+    met = [sz for sz in results if feasible(sz)]
+    best = min(met, key=lambda sz: (gate_area_um2(gate, sz), sz)) if met else snap_sizes(best)
+
+    evaluated = []
+    for sz, meas_ps in results.items():
+        delays = constrained_delays(meas_ps, constraints)
+        if len(delays) < len(constraints):
+            continue
+        evaluated.append({
+            "wn_um": sz[0], "wp_um": sz[1],
+            "area_um2": gate_area_um2(gate, sz),
+            "delay_ps": max(delays.values()),
+            "meets_target": feasible(sz),
+            **{k: float(v) for k, v in meas_ps.items()},
+        })
+    front = pareto_front(evaluated)
+
+    out_csv = f"sizing_pareto_{gate}.csv"
+    metric_cols = sorted({k for p in front for k in p} - {"wn_um", "wp_um", "area_um2", "delay_ps", "meets_target"})
+    with open(out_csv, "w", newline="") as f:
+        w = csv.DictWriter(f, fieldnames=["gate", "vdd_V", "temp_C", "load", "wn_um", "wp_um",
+                                          "area_um2", "delay_ps", "meets_target"] + metric_cols, restval="")
+        w.writeheader()
+        for p in front:
+            w.writerow({"gate": gate, "vdd_V": vdd, "temp_C": temp_c, "load": load, **p})
+    print(f"\n[sizing] {len(results)} sizes evaluated; Pareto front ({len(front)} points) saved: {out_csv}")
+    for p in front:
+        print(f"  Wn={p['wn_um']:g}u Wp={p['wp_um']:g}u  area={p['area_um2']:.4f} um^2  "
+              f"delay={p['delay_ps']:.3f} ps{'  (meets target)' if p['meets_target'] else ''}")
+
+    if evaluated:
+        plot_pareto(evaluated, front, min(limit for _, limit in constraints.values()), f"sizing_pareto_{gate}.png")
+    if best in results and feasible(best):
+        print(f"[sizing] Best: Wn={best[0]:g}u Wp={best[1]:g}u (area {gate_area_um2(gate, best):.4f} um^2)")
+    else:
+        print("[sizing] No sizing in range met the targets.")
+    return best, front
+
+# ---------- Regression comparison against golden results ----------
+# Joins a new sweep to a golden CSV on (gate, vdd_V, temp_C, load_fF) and
+# checks every golden metric with |new - golden| <= abs_tol + rel_tol*|golden|.
+# A metric the new side lacks (blank or no column) is out of tolerance.
+# The "new" side is either another CSV or a re-simulation of the golden points
+# with the current model/templates. In that case large sweeps are first
+# spot-checked on a stratified subset and only fully re-run if drift shows up.
+COMPARE_BASE_COLS = ["gate", "vdd_V", "temp_C", "load", "load_fF"]
+COMPARE_FULL_MAX = 30      # golden sweeps larger than this are spot-checked first
+COMPARE_PER_STRATUM = 3    # loads kept per (gate, vdd, temp) in the spot check
+
+def sweep_key(gate, vdd, temp_c, load_fF):
+    return f"{gate}|{float(vdd):g}|{int(float(temp_c))}|{float(load_fF or 0):g}"
+
+def sweep_table(rows):
+    """
+    CSV-style dict rows -> (keys, metrics): keys is a str ndarray of sweep_key()s,
+    metrics maps lower-cased metric name -> float ndarray (NaN where missing).
+    """
+    import numpy as np
+    keys = np.array([sweep_key(r["gate"], r["vdd_V"], r["temp_C"], r["load_fF"]) for r in rows], dtype=str)
+    names = {}
+    for r in rows:
+        for k in r:
+            if k not in COMPARE_BASE_COLS:
+                names.setdefault(k.lower(), k)
+    metrics = {}
+    for low, k in names.items():
+        vals = [r.get(k, "") for r in rows]
+        metrics[low] = np.array([float(v) if v not in ("", None) else np.nan for v in vals])
+    return keys, metrics
+
+def read_sweep_csv(path):
+    with open(path, "r", newline="") as f:
+        return list(csv.DictReader(f))
+
+def compare_tables(golden, new, abs_tol, rel_tol):
+    """
+    Vectorized join + tolerance check of two sweep_table()s, driven by the golden
+    metric columns. Returns dict(keys, metrics{name: (golden, new, abs, rel, ok)},
+    ok, missing) in golden row order; missing counts golden points with no match in new.
+    """
+    import numpy as np
+    gk, gm = golden
+    nk, nm = new
+    common, gi, ni = np.intersect1d(gk, nk, assume_unique=False, return_indices=True)
+    order = np.argsort(gi, kind="stable")  # intersect1d sorts keys as strings; keep golden row order
+    common, gi, ni = common[order], gi[order], ni[order]
+    ok = np.ones(len(common), dtype=bool)
+    metrics = {}
+    for name in sorted(gm):
+        g = gm[name][gi]
+        n = nm[name][ni] if name in nm else np.full(len(common), np.nan)
+        d = n - g
+        with np.errstate(divide="ignore", invalid="ignore"):
+            rel = np.where(g != 0, d / np.abs(g), np.nan)
+        m_ok = np.abs(d) <= abs_tol + rel_tol * np.abs(g)  # NaN on the new side compares False
+        m_ok |= np.isnan(g)  # blank golden cell: nothing to check against
+        metrics[name] = (g, n, d, rel, m_ok)
+        ok &= m_ok
+    return {"keys": common, "metrics": metrics, "ok": ok, "missing": int((~np.isin(gk, nk)).sum())}
+
+def write_compare_report(result, path):
+    cols = ["gate", "vdd_V", "temp_C", "load_fF"]
+    for name in result["metrics"]:
+        cols += [f"{name}_golden", f"{name}_new", f"{name}_abs", f"{name}_rel"]
+    cols.append("ok")
+    with open(path, "w", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(cols)
+        for i, key in enumerate(result["keys"]):
+            row = key.split("|")
+            for g, n, d, rel, _ in result["metrics"].values():
+                row += [f"{g[i]:g}", f"{n[i]:g}", f"{d[i]:g}", f"{rel[i]:g}"]
+            row.append("ok" if result["ok"][i] else "FAIL")
+            w.writerow(row)
+
+def stratified_subset(rows, per_stratum=COMPARE_PER_STRATUM):
+    """Per (gate, vdd, temp): the smallest, largest and evenly spaced loads in between."""
+    strata = {}
+    for r in rows:
+        strata.setdefault((r["gate"], r["vdd_V"], r["temp_C"]), []).append(r)
+    subset = []
+    for members in strata.values():
+        members = sorted(members, key=lambda r: float(r["load_fF"] or 0))
+        if len(members) <= per_stratum:
+            subset += members
+            continue
+        step = (len(members) - 1) / (per_stratum - 1)
+        subset += [members[round(i * step)] for i in range(per_stratum)]
+    return subset
+
+def resimulate_rows(golden_rows, golden_table, abs_tol, rel_tol, fail_fast, ws=None):
+    """Re-simulate golden points in order (cached where possible); stops at the first failure if fail_fast."""
+    deps = load_deps()
+    model_hash = sha256_file(MODEL_PATH)
+    new_rows = []
+    try:
+        for r in golden_rows:
+            gate, vdd, temp_c = r["gate"], float(r["vdd_V"]), int(float(r["temp_C"]))
+            load = r["load"] or (f"{float(r['load_fF']):g}fF" if r["load_fF"] else "")
+            meas_ps = cached_meas(deps, point_id(gate, vdd, temp_c, load), model_hash)
+            if meas_ps is None:
+                print(f"[compare] simulating {gate} VDD={vdd:g}V {temp_c}C Cload={load or 'n/a'} ...")
+                meas_ps, outputs = simulate_point(gate, vdd, temp_c, load, "* no load capacitor", ws)
+                record_point(deps, gate, vdd, temp_c, load, "* no load capacitor", meas_ps,
+                             ws.kept(outputs) if ws else outputs, model_hash=model_hash)
+            new_rows.append(make_csv_row(gate, vdd, temp_c, load, meas_ps))
+            if fail_fast:
+                single = compare_tables(golden_table, sweep_table(new_rows[-1:]), abs_tol, rel_tol)
+                if not single["ok"].all():
+                    print(f"[compare] first failure at {single['keys'][0]}; stopping early")
+                    break
+    finally:
+        save_deps(deps)
+    return new_rows
+
+def compare_with_golden(golden_path, new_path=None, abs_tol=0.5, rel_tol=0.02, fail_fast=False,
+                        full=False, ws=None, report_path="compare_report.csv", allow_missing=False):
+    """
+    Returns True when every joined point is within tolerance and, with new_path,
+    every golden point has a match (unless allow_missing).
+    """
+    import numpy as np
+    golden_rows = read_sweep_csv(golden_path)
+    golden = sweep_table(golden_rows)
+
+    unchecked = 0
+    if new_path:
+        result = compare_tables(golden, sweep_table(read_sweep_csv(new_path)), abs_tol, rel_tol)
+    else:
+        spot_check = not full and len(golden_rows) > COMPARE_FULL_MAX
+        first = stratified_subset(golden_rows) if spot_check else golden_rows
+        if spot_check:
+            print(f"[compare] spot-checking {len(first)} of {len(golden_rows)} golden points")
+        new_rows = resimulate_rows(first, golden, abs_tol, rel_tol, fail_fast, ws)
+        if len(new_rows) < len(first):  # --fail-fast stopped before the end
+            unchecked = len(golden_rows) - len(new_rows)
+        result = compare_tables(golden, sweep_table(new_rows), abs_tol, rel_tol)
+        if spot_check and not result["ok"].all() and not fail_fast:
+            print("[compare] drift detected in spot check; re-simulating the full golden sweep")
+            done = set(result["keys"].tolist())
+            rest = [r for r in golden_rows
+                    if sweep_key(r["gate"], r["vdd_V"], r["temp_C"], r["load_fF"]) not in done]
+            new_rows += resimulate_rows(rest, golden, abs_tol, rel_tol, False, ws)
+            result = compare_tables(golden, sweep_table(new_rows), abs_tol, rel_tol)
+        result["missing"] = 0  # every re-simulated point joins; unreached ones are in unchecked
+
+    write_compare_report(result, report_path)
+    n_fail = int((~result["ok"]).sum())
+    print(f"\n[compare] {len(result['keys'])} points joined on gate/vdd_V/temp_C/load_fF, "
+          f"{n_fail} out of tolerance (abs {abs_tol:g} ps, rel {rel_tol:g}); report: {report_path}")
+    if result["missing"]:
+        print(f"[compare] {result['missing']} golden points have no match in the new sweep"
+              + (" (allowed by --allow-missing)" if allow_missing else ""))
+    if unchecked:
+        print(f"[compare] stopped early at the first failure; {unchecked} of {len(golden_rows)} "
+              f"golden points were not checked")
+    for name, (g, n, d, rel, m_ok) in result["metrics"].items():
+        if len(d):
+            worst = int(np.nanargmax(np.abs(d))) if not np.isnan(d).all() else 0
+            print(f"  {name}: max |delta| = {abs(d[worst]):.3f} ps ({rel[worst]:+.2%}) at {result['keys'][worst]}, "
+                  f"{int((~m_ok).sum())} failing")
+    return n_fail == 0 and (allow_missing or not result["missing"])
 
 # ========== CLI ==========
 def main():
     ap = argparse.ArgumentParser(description="ngspice AI agent (PTM45) with load-cap sweep")
-    ap.add_argument("--mode", choices=["batch","interactive"], default="interactive",
-                    help="Run mode: interactive opens ngspice GUI; batch extracts measurements.")
+    ap.add_argument("--mode", choices=["batch","interactive","rerun","optimize","compare"], default="interactive",
+                    help="Run mode: interactive opens ngspice GUI; batch extracts measurements; "
+                         "rerun re-simulates points recorded in agent_deps.json; "
+                         "optimize sizes Wn/Wp for a delay target (also used for 'size ...' prompts in batch); "
+                         "compare checks results against a golden CSV.")
+    ap.add_argument("--stale", action="store_true",
+                    help="With --mode rerun: only re-simulate points whose model/template changed.")
+    ap.add_argument("--scratch", default=SCRATCH_DEFAULT,
+                    help="Fast scratch root for per-run decks and raw outputs (default: %(default)s).")
+    ap.add_argument("--no-scratch", action="store_true",
+                    help="Write decks and raw outputs into the CWD instead of a scratch workspace.")
+    ap.add_argument("--jobs", type=int, default=None,
+                    help="Parallel ngspice runs for the sizing optimizer (default: CPU count).")
+    ap.add_argument("--max-evals", type=int, default=60,
+                    help="Simulation budget for the sizing optimizer.")
+    ap.add_argument("--golden", help="With --mode compare: golden sweep CSV.")
+    ap.add_argument("--new", dest="new_csv",
+                    help="With --mode compare: sweep CSV to check (default: re-simulate the golden points).")
+    ap.add_argument("--abs-tol", type=float, default=0.5, help="Compare: absolute tolerance in ps.")
+    ap.add_argument("--rel-tol", type=float, default=0.02, help="Compare: relative tolerance (0.02 = 2%%).")
+    ap.add_argument("--fail-fast", action="store_true",
+                    help="Compare: stop re-simulating at the first out-of-tolerance point.")
+    ap.add_argument("--full", action="store_true",
+                    help="Compare: re-simulate every golden point instead of a stratified spot check first.")
+    ap.add_argument("--allow-missing", action="store_true",
+                    help="Compare with --new: do not fail on golden points absent from the new CSV.")
+    ap.add_argument("--keep", nargs="+", choices=ARTIFACT_KINDS, default=[],
+                    help="Scratch artifacts to keep, bundled into artifacts_*.tar.gz per sweep.")
     ap.add_argument("--open-images", action="store_true",
                     help="After batch, open all generated images with the OS default viewer.")
     ap.add_argument("--jpg", action="store_true",
                     help="Export JPG in addition to (or instead of) PNG.")
     args = ap.parse_args()
 
+    if args.mode == "compare":
+        if not args.golden:
+            ap.error("--mode compare requires --golden CSV")
+        with make_workspace(args, "compare") as ws:
+            ok = compare_with_golden(args.golden, args.new_csv, args.abs_tol, args.rel_tol,
+                                     args.fail_fast, args.full, ws, allow_missing=args.allow_missing)
+        sys.exit(0 if ok else 1)
+
+    if args.mode == "rerun":
+        with make_workspace(args, "rerun") as ws:
+            rerun_from_deps(only_stale=args.stale, jpg_flag=args.jpg, ws=ws)
+        return
+
     prompt = input("Enter your simulation request: ").strip()
+
+    sizing = parse_sizing_request(prompt)
+    if args.mode == "optimize" or (args.mode == "batch" and sizing):
+        if not sizing:
+            ap.error("optimize mode expects e.g. 'size nand2 for tPHL < 20 ps at 20 fF, 110 C, minimize area'")
+        with make_workspace(args, f"sizing_{sizing['gate']}") as ws:
+            optimize_sizing(sizing, ws=ws, jobs=args.jobs, max_evals=args.max_evals)
+        return
     parsed = parse_with_gemini(prompt) if USE_GEMINI else parse_with_rules(prompt)
     params = normalize_params(parsed, prompt)
 
@@ -652,87 +1673,65 @@ def main():
         load_line = f"Cl out 0 {load_text}" if load_text else single_load_line
         cap_tag = sanitize_cap_for_tag(load_text) if load_text else "noC"
         net = build_netlist(gate, vdd, temp_c, load_line, cap_tag, interactive=True)
-        run_ngspice(net, f"agent_run_{temp_c}C_{cap_tag}.cir", interactive=True)
+        run_ngspice(net, f"agent_run_{point_run_tag(gate, vdd, temp_c, cap_tag)}.cir", interactive=True)
     else:
         # ==== NEW: we'll aggregate results to CSV and make plots
+        deps = load_deps()
+        model_hash = sha256_file(MODEL_PATH)
         csv_rows = []
+        point_ids = []
         all_metric_names = set()
         # per-metric per-temp point collectors for plots
         metric_points_by_temp = {}  # dict[metric_name] -> dict[tempC] -> list[(C_fF, delay_ps)]
 
         image_files = []
-        for t in temps:
-            for load_text in (loads_list or [""]):
-                load_line = f"Cl out 0 {load_text}" if load_text else single_load_line
-                cap_tag = sanitize_cap_for_tag(load_text) if load_text else "noC"
-
-                net = build_netlist(gate, vdd, int(t), load_line, cap_tag, interactive=False)
-                deck_name = f"agent_run_{t}C_{cap_tag}.cir"
-                print(f"\nRunning batch @ TEMP={t}C, Cload={load_text or 'n/a'} ...")
-                meas = run_ngspice(net, deck_name, interactive=False)
-
-                # (1) Pretty print
-                if meas:
-                    meas_ps = meas_to_ps(meas)  # dict like {"tPLH": ps, "tPHL": ps} or NAND2 keys
-                    print("Measurements (ps):", pretty_ps(meas_ps))
-                else:
-                    meas_ps = {}
-                    print("Measurements:", "(none)")
-
-                # (2) Save wrdata -> PNG waveforms
-                dat = f"sim_{t}C_{cap_tag}.dat"
-                png = f"agent_run_{t}C_{cap_tag}.png"
-                ok = plot_from_wrdata(dat, png, gate)
-                if ok:
-                    if args.jpg:
-                        jpg = f"agent_run_{t}C_{cap_tag}.jpg"
-                        if to_jpg(png, jpg):
-                            image_files.append(jpg)
+        with make_workspace(args, f"{gate}_{vdd:g}V") as ws:
+            for t in temps:
+                for load_text in (loads_list or [""]):
+                    print(f"\nRunning batch @ TEMP={t}C, Cload={load_text or 'n/a'} ...")
+                    meas_ps, outputs = simulate_point(gate, vdd, int(t), load_text, single_load_line, ws)
+
+                    # (1) Pretty print
+                    if meas_ps:
+                        print("Measurements (ps):", pretty_ps(meas_ps))
+                    else:
+                        print("Measurements:", "(none)")
+
+                    # (2) Save wrdata -> PNG waveforms
+                    png = outputs["png"]
+                    ok = plot_from_wrdata(outputs["dat"], png, gate)
+                    if ok:
+                        if args.jpg:
+                            jpg = png[:-len(".png")] + ".jpg"
+                            if to_jpg(png, jpg):
+                                image_files.append(jpg)
+                            else:
+                                image_files.append(png)
                         else:
                             image_files.append(png)
-                    else:
-                        image_files.append(png)
-
-                # (3) Accumulate CSV row
-                row = {
-                    "gate": gate,
-                    "vdd_V": vdd,
-                    "temp_C": int(t),
-                    "load": load_text or "",
-                    "load_fF": cap_text_to_fF(load_text) if load_text else ""
-                }
-                # normalize measurement keys to lower for columns, but keep original names too
-                for k, v in meas_ps.items():
-                    # k might be 'tPLH', 'tPHL', 'tPLH_in1', ...
-                    row[k] = float(v) if v is not None else ""
-                    all_metric_names.add(k)
-                csv_rows.append(row)
-
-                # (4) Fill points for plotting delay vs Cload per temp/metric
-                c_val = cap_text_to_fF(load_text) if load_text else None
-                for k, v in meas_ps.items():
-                    metric_points_by_temp.setdefault(k, {}).setdefault(int(t), []).append((c_val, float(v)))
+
+                    # (3) Accumulate CSV row
+                    csv_rows.append(make_csv_row(gate, vdd, int(t), load_text, meas_ps))
+                    all_metric_names.update(meas_ps)
+                    point_ids.append(record_point(deps, gate, vdd, int(t), load_text, single_load_line, meas_ps,
+                                                  ws.kept(outputs), model_hash=model_hash))
+
+                    # (4) Fill points for plotting delay vs Cload per temp/metric
+                    c_val = cap_text_to_fF(load_text) if load_text else None
+                    for k, v in meas_ps.items():
+                        metric_points_by_temp.setdefault(k, {}).setdefault(int(t), []).append((c_val, float(v)))
 
         # ---- write CSV at end
-        # Determine consistent header
-        base_cols = ["gate", "vdd_V", "temp_C", "load", "load_fF"]
-        metric_cols = sorted(all_metric_names)  # stable order
-        header = base_cols + metric_cols
-        out_csv = "meas_sweep.csv"
-        with open(out_csv, "w", newline="") as f:
-            w = csv.DictWriter(f, fieldnames=header)
-            w.writeheader()
-            for r in csv_rows:
-                # ensure missing metric keys exist with blank
-                for m in metric_cols:
-                    if m not in r:
-                        r[m] = ""
-                w.writerow(r)
+        out_csv = sweep_csv_name(gate, vdd)
+        write_meas_csv(csv_rows, all_metric_names, out_csv)
+        record_csv(deps, out_csv, point_ids)
         print(f"\nSaved CSV: {out_csv}")
 
         # ---- make quick plots of delay vs Cload by metric & temp
         for metric_name, temp_map in metric_points_by_temp.items():
-            plot_delay_vs_cload(temp_map, metric_name)
+            for tempC, fname in plot_delay_vs_cload(temp_map, metric_name, sweep_tag(gate, vdd)):
+                record_plot(deps, fname, metric_name, tempC, point_ids, sweep_tag(gate, vdd))
+        save_deps(deps)
         print("Generated delay-vs-Cload plots for any metrics found.")
 
         if args.open_images and image_files: